@@ -0,0 +1,104 @@
+# ai/decision_cache.py
+"""
+Мемоизация решений по квантованной сигнатуре состояния и гистерезис режимов
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+HP_BUCKETS = 10
+# Клетка карты (в координатах мира) для сигнатуры отступления
+POSITION_BUCKET = 100
+
+# Приоритет режимов: повышение происходит сразу, понижение — с задержкой
+MODE_PRIORITY = {"idle": 0, "farm": 1, "fight": 2}
+
+
+def hp_bucket(hp_ratio: float) -> int:
+    """Номер корзины HP (0..HP_BUCKETS)"""
+    return min(HP_BUCKETS, max(0, int(hp_ratio * HP_BUCKETS)))
+
+
+def position_bucket(position) -> tuple:
+    """Грубая клетка карты для позиции"""
+    x, y = position
+    return int(x) // POSITION_BUCKET, int(y) // POSITION_BUCKET
+
+
+class DecisionCache:
+    """
+    LRU-кеш решений с ограниченным размером.
+    Счётчики попаданий/промахов пишутся в переданный словарь stats
+    (обычно performance_stats владельца).
+    """
+
+    def __init__(self, max_size: int = 256, stats: Optional[Dict[str, Any]] = None):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+        self.stats = stats if stats is not None else {}
+        self.stats.setdefault('decision_cache_hits', 0)
+        self.stats.setdefault('decision_cache_misses', 0)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        decision = self._entries.get(key)
+        if decision is None:
+            self.stats['decision_cache_misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats['decision_cache_hits'] += 1
+        return decision
+
+    def put(self, key: Hashable, decision: Any):
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ModeHysteresis:
+    """
+    Выбор режима idle / farm / fight / retreat с гистерезисом:
+    - в retreat входим при HP < retreat_enter, выходим только при HP >= retreat_exit;
+    - понижение режима (fight -> farm -> idle) происходит только после того,
+      как причина режима пропала grace_ticks тиков подряд.
+    """
+
+    def __init__(self, retreat_enter: float = 0.3, retreat_exit: float = 0.45, grace_ticks: int = 3):
+        self.retreat_enter = retreat_enter
+        self.retreat_exit = retreat_exit
+        self.grace_ticks = grace_ticks
+
+        self.mode = "idle"
+        self._grace = 0
+
+    def update(self, hp_ratio: float, enemies: int, creeps: int) -> str:
+        threshold = self.retreat_exit if self.mode == "retreat" else self.retreat_enter
+        if hp_ratio < threshold:
+            self.mode = "retreat"
+            self._grace = 0
+            return self.mode
+
+        if enemies > 0:
+            wanted = "fight"
+        elif creeps > 0:
+            wanted = "farm"
+        else:
+            wanted = "idle"
+
+        current = MODE_PRIORITY.get(self.mode)
+        if current is not None and MODE_PRIORITY[wanted] < current and self._grace < self.grace_ticks:
+            self._grace += 1
+            return self.mode
+
+        self._grace = 0
+        self.mode = wanted
+        return self.mode
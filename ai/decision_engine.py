@@ -1,5 +1,7 @@
 from enum import Enum, auto
 
+from ai.decision_cache import DecisionCache, ModeHysteresis, hp_bucket, position_bucket
+
 
 class Action(Enum):
     IDLE = auto()
@@ -10,28 +12,107 @@ class Action(Enum):
 
 
 class DecisionEngine:
+    """
+    hero.position и собственные цели движка (отступ, точка на лайне) заданы
+    в координатах мира; позиции юнитов — в координатах клика. to_screen
+    переводит мир в координаты клика, если они различаются (например,
+    когда юниты берутся с экрана).
+    """
+
+    def __init__(self, to_screen=None):
+        self.to_screen = to_screen
+        self.performance_stats = {}
+
+        # Гистерезис режимов и кеш решений по квантованному состоянию
+        self.modes = ModeHysteresis()
+        self.cache = DecisionCache(stats=self.performance_stats)
+
+        # Закешированный план последнего решения (для дедупликации команд
+        # и удержания цели)
+        self.last_plan = None
+
     def decide(self, hero, game):
+        """
+        Решение (Action, точка клика). В кеше хранится план — действие и ID
+        цели; точка клика на каждом тике берётся из текущей позиции цели.
+        """
         if not hero.is_alive:
+            self.last_plan = None
             return Action.IDLE, None
 
         hp_ratio = hero.hp / hero.max_hp
+        mode = self.modes.update(hp_ratio, len(game.heroes_enemy), len(game.creeps_enemy))
+        target = self.mode_target(mode, game)
+
+        key = (mode, hp_bucket(hp_ratio), len(game.heroes_enemy), self.target_key(mode, hero, target))
+        plan = self.cache.get(key)
+        if plan is None:
+            plan = self._plan(mode, target)
+            self.cache.put(key, plan)
+
+        self.last_plan = plan
+        return plan[0], self.plan_position(plan[0], hero, target)
 
+    def _plan(self, mode, target):
         # 1. Критическое ХП — отступаем
-        if hp_ratio < 0.3:
-            return Action.RETREAT, self.safe_position(hero)
+        if mode == "retreat":
+            return Action.RETREAT, None
 
         # 2. Есть враг — атакуем
-        if game.heroes_enemy:
-            enemy = game.heroes_enemy[0]
-            return Action.ATTACK, enemy.position
+        if mode == "fight" and target is not None:
+            return Action.ATTACK, target.unit_id
 
         # 3. Есть крипы — фармим
-        if game.creeps_enemy:
-            creep = game.creeps_enemy[0]
-            return Action.FARM, creep.position
+        if mode == "farm" and target is not None:
+            return Action.FARM, target.unit_id
 
         # 4. Иначе — стоим на лайне
-        return Action.MOVE, self.lane_position()
+        return Action.MOVE, None
+
+    def plan_position(self, action, hero, target):
+        """Точка клика для действия плана по текущему состоянию"""
+        if action == Action.RETREAT:
+            return self.click_position(self.safe_position(hero))
+        if action in (Action.ATTACK, Action.FARM):
+            return target.position
+        return self.click_position(self.lane_position())
+
+    def mode_target(self, mode, game):
+        """
+        Цель режима среди видимых юнитов: цель прошлого плана, пока она видна,
+        иначе первая видимая. Если целей нет, режим держится гистерезисом
+        без цели.
+        """
+        if mode == "fight":
+            units = game.heroes_enemy
+        elif mode == "farm":
+            units = game.creeps_enemy
+        else:
+            return None
+
+        if not units:
+            return None
+
+        held_id = self.last_plan[1] if self.last_plan is not None else None
+        return self.find_unit(held_id, units) or units[0]
+
+    def find_unit(self, unit_id, units):
+        """Текущий юнит с данным ID (без трекинга ID нет — None)"""
+        if unit_id is None:
+            return None
+        return next((u for u in units if u.unit_id == unit_id), None)
+
+    def target_key(self, mode, hero, target):
+        """ID цели для сигнатуры; при отступлении — клетка героя"""
+        if mode == "retreat":
+            return position_bucket(hero.position)
+        if target is None:
+            return None
+        return target.unit_id
+
+    def click_position(self, point):
+        """Точка мира -> координаты клика"""
+        return self.to_screen(*point) if self.to_screen else point
 
     def safe_position(self, hero):
         x, y = hero.position
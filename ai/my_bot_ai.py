@@ -2,6 +2,7 @@ from typing import Dict, Any
 import time
 
 from ai.bot_ai import BotAI
+from ai.decision_cache import DecisionCache, ModeHysteresis, hp_bucket
 
 
 class MyBotAI(BotAI):
@@ -16,10 +17,15 @@ class MyBotAI(BotAI):
         # Внутреннее состояние логики
         self.current_mode = "idle"   # idle / farm / fight / retreat
 
+        # Гистерезис режимов и кеш решений по квантованному состоянию
+        self.modes = ModeHysteresis()
+        self.decision_cache = DecisionCache(stats=self.performance_stats)
+
     def make_decision(self) -> Dict[str, Any]:
         """
         Принятие решения на основе текущего состояния игры
-        Ожидается, что self.game_state уже обновлён извне
+        Ожидается, что self.game_state уже обновлён извне.
+        При неизменной сигнатуре состояния возвращается тот же объект решения.
         """
 
         # Защита от пустого состояния
@@ -30,32 +36,46 @@ class MyBotAI(BotAI):
         enemies_visible = self.game_state.get("enemies_visible", 0)
         creeps_visible = self.game_state.get("creeps_visible", 0)
 
+        self.current_mode = self.modes.update(hero_hp, enemies_visible, creeps_visible)
+
+        key = (
+            self.current_mode,
+            hp_bucket(hero_hp),
+            enemies_visible,
+            self.game_state.get("target_id")
+        )
+        decision = self.decision_cache.get(key)
+        if decision is None:
+            decision = self._decide(self.current_mode)
+            self.decision_cache.put(key, decision)
+
+        return decision
+
+    def _decide(self, mode: str) -> Dict[str, Any]:
+        """Решение для режима, выбранного с учётом гистерезиса"""
+
         # 1. Критическое ХП — отступаем
-        if hero_hp < 0.3:
-            self.current_mode = "retreat"
+        if mode == "retreat":
             return {
                 "action": "retreat",
                 "target": "fountain"
             }
 
         # 2. Есть враги — дерёмся
-        if enemies_visible > 0:
-            self.current_mode = "fight"
+        if mode == "fight":
             return {
                 "action": "attack",
                 "target": "enemy_hero"
             }
 
         # 3. Есть крипы — фарм
-        if creeps_visible > 0:
-            self.current_mode = "farm"
+        if mode == "farm":
             return {
                 "action": "farm",
                 "target": "creep"
             }
 
         # 4. Иначе — движение по линии
-        self.current_mode = "idle"
         return {
             "action": "move",
             "target_x": 3000,
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 
 @dataclass
@@ -10,6 +10,9 @@ class Unit:
     position: Tuple[int, int]
     is_enemy: bool
     is_hero: bool
+    unit_id: Optional[int] = None
+    # Положение не подтверждено кадром, а предсказано трекером
+    predicted: bool = False
 
 
 @dataclass
@@ -0,0 +1,208 @@
+"""
+Бенчмарк трекера юнитов: полная детекция на каждом кадре против
+детекции раз в N кадров с трекингом между ними.
+
+Кадры идут с частотой тиков BotController (раз в 0.5 с), поэтому между
+кадрами юниты смещаются на десятки пикселей.
+
+На синтетической записи ID сравниваются с истинными: считаются смены ID,
+слияния треков, пропуски, ложные юниты, юниты по предсказанию (coasting) и
+ошибки типа герой/крип. В записи есть свободно летающие юниты, плотная
+волна крипов и пары, идущие друг сквозь друга.
+
+Запуск:
+    python -m benchmarks.bench_tracker                  # синтетическая запись
+    python -m benchmarks.bench_tracker --rate 30        # частота кадров выше тиков контроллера
+    python -m benchmarks.bench_tracker --frames rec/    # записанные кадры (png/jpg)
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ai.types import Unit
+from sim.render import (ALLY_BAR, BACKGROUND, CREEP_BAR_HEIGHT, CREEP_BAR_WIDTH, ENEMY_BAR,
+                        HERO_BAR_HEIGHT, HERO_BAR_WIDTH, draw_hp_bar)
+from vision.feature_store import FrameFeatureStore
+from vision.tracker import UnitTracker
+from vision.unit_detector import detect_units, check_tracks
+
+# Частота тиков BotController.run (sleep 0.5 с)
+TICK_RATE = 2.0
+# Максимальное расстояние (px) от юнита трекера до истинного юнита
+MATCH_RADIUS = 15.0
+
+
+class GroundTruth:
+    """Истинные положения юнитов по кадрам: positions[frame, unit]"""
+
+    def __init__(self, positions: np.ndarray, enemy: np.ndarray, hero: np.ndarray):
+        self.positions = positions
+        self.enemy = enemy
+        self.hero = hero
+
+
+def synthetic_sequence(count: int, width: int = 640, height: int = 360, free_units: int = 8,
+                       rate: float = TICK_RATE) -> Tuple[List[np.ndarray], GroundTruth]:
+    """Кадры с полосками HP и истинные положения юнитов (скорости в px/с)"""
+    rng = np.random.default_rng(0)
+
+    # Все юниты отражаются от краёв; волна крипов — целиком, как одна группа
+    pos = [rng.uniform((60, 60), (width - 60, height - 60), size=(free_units, 2))]
+    vel = [rng.uniform(-90, 90, size=(free_units, 2))]
+    enemy = [rng.random(free_units) < 0.5]
+    hero = [rng.random(free_units) < 0.3]
+
+    # Волна из 4 союзных крипов с зазором 10 px между полосками
+    pos.append(np.array([(100 + 34 * i, 300) for i in range(4)], dtype=float))
+    vel.append(np.tile((50.0, -12.0), (4, 1)))
+    enemy.append(np.zeros(4, dtype=bool))
+    hero.append(np.zeros(4, dtype=bool))
+
+    # Две пары вражеских крипов, идущих навстречу друг другу
+    pos.append(np.array([(150, 80), (450, 80), (150, 230), (450, 230)], dtype=float))
+    vel.append(np.array([(60, 0), (-60, 0), (60, 5), (-60, -5)], dtype=float))
+    enemy.append(np.ones(4, dtype=bool))
+    hero.append(np.zeros(4, dtype=bool))
+
+    pos, vel = np.concatenate(pos), np.concatenate(vel)
+    enemy, hero = np.concatenate(enemy), np.concatenate(hero)
+    fill = rng.uniform(0.3, 1.0, size=len(pos))
+    group = np.arange(len(pos))
+    group[free_units:free_units + 4] = free_units
+
+    frames, positions = [], []
+    for _ in range(count):
+        frame = np.full((height, width, 3), BACKGROUND, dtype=np.uint8)
+        for i in range(len(pos)):
+            x, y = pos[i].astype(int)
+            bar_w, bar_h = (HERO_BAR_WIDTH, HERO_BAR_HEIGHT) if hero[i] else (CREEP_BAR_WIDTH, CREEP_BAR_HEIGHT)
+            draw_hp_bar(frame, x, y, bar_w, bar_h, fill[i], ENEMY_BAR if enemy[i] else ALLY_BAR)
+        frames.append(frame)
+        positions.append(pos.copy())
+
+        pos += vel / rate
+        out = (pos < 30) | (pos > (width - 30, height - 30))
+        flip = np.zeros((len(pos), 2), dtype=bool)
+        np.logical_or.at(flip, group, out)
+        vel[flip[group]] *= -1
+
+    return frames, GroundTruth(np.array(positions), enemy, hero)
+
+
+def load_frames(path: Path) -> List[np.ndarray]:
+    files = sorted(p for p in path.iterdir() if p.suffix.lower() in ('.png', '.jpg', '.jpeg'))
+    return [cv2.imread(str(p)) for p in files]
+
+
+def match_to_truth(units, truth: np.ndarray, enemy: np.ndarray) -> Dict[int, Unit]:
+    """Жадное сопоставление юнитов трекера с истинными: индекс истинного -> юнит"""
+    if not units:
+        return {}
+
+    measured = np.array([u.position for u in units], dtype=float)
+    cost = np.linalg.norm(truth[:, None, :] - measured[None, :, :], axis=2)
+    cost[enemy[:, None] != np.array([u.is_enemy for u in units])[None, :]] = np.inf
+
+    result = {}
+    used = set()
+    for flat in np.argsort(cost, axis=None):
+        g, u = np.unravel_index(flat, cost.shape)
+        if cost[g, u] > MATCH_RADIUS:
+            break
+        if g in result or u in used:
+            continue
+        result[int(g)] = units[u]
+        used.add(u)
+    return result
+
+
+def run(frames: List[np.ndarray], detect_interval: int, truth: Optional[GroundTruth] = None,
+        rate: float = TICK_RATE):
+    store = FrameFeatureStore()
+    tracker = UnitTracker()
+
+    detect_time = 0.0
+    result = {'id_switches': 0, 'merged': 0, 'missed': 0, 'ghosts': 0, 'coasting': 0, 'wrong_class': 0}
+    last_id: Dict[int, int] = {}
+
+    for i, frame in enumerate(frames):
+        t = i / rate
+        store.begin_frame(frame)
+        # HSV кадра контроллер считает в любом случае (analyze_game_state),
+        # поэтому в стоимость детекции он не входит
+        store.hsv()
+
+        start = time.perf_counter()
+        if i % detect_interval == 0 or not tracker.tracks:
+            units = tracker.update(detect_units(store), t)
+        else:
+            units = tracker.refine(check_tracks(store, tracker.predict(t), t), t)
+        detect_time += time.perf_counter() - start
+
+        # Несколько треков в одной точке — слияние
+        positions = [u.position for u in units]
+        result['merged'] += len(positions) - len(set(positions))
+        result['coasting'] += sum(u.predicted for u in units)
+
+        if truth is None:
+            continue
+
+        matched = match_to_truth(units, truth.positions[i], truth.enemy)
+        result['missed'] += len(truth.enemy) - len(matched)
+        result['ghosts'] += len(units) - len(matched)
+
+        for g, unit in matched.items():
+            if g in last_id and last_id[g] != unit.unit_id:
+                result['id_switches'] += 1
+            last_id[g] = unit.unit_id
+            result['wrong_class'] += unit.is_hero != truth.hero[g]
+
+    result['detect_ms_per_frame'] = 1000 * detect_time / len(frames)
+    result['tracks_created'] = tracker.stats['created']
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tracker benchmark")
+    ap.add_argument("--frames", type=Path, help="directory with recorded frames")
+    ap.add_argument("--count", type=int, default=300, help="synthetic frame count")
+    ap.add_argument("--interval", type=int, default=5, help="full detection every N frames")
+    ap.add_argument("--rate", type=float, default=TICK_RATE, help="frames per second")
+    args = ap.parse_args()
+
+    truth = None
+    if args.frames:
+        frames = load_frames(args.frames)
+    else:
+        frames, truth = synthetic_sequence(args.count, rate=args.rate)
+
+    if not frames:
+        print("Нет кадров")
+        return
+
+    for interval in (1, args.interval):
+        result = run(frames, interval, truth, args.rate)
+        line = (
+            f"interval={interval:<3} "
+            f"detect={result['detect_ms_per_frame']:.2f} ms/frame  "
+            f"tracks_created={result['tracks_created']}  "
+            f"merged={result['merged']}  "
+            f"coasting={result['coasting']}"
+        )
+        if truth is not None:
+            line += (
+                f"  id_switches={result['id_switches']}"
+                f"  missed={result['missed']}"
+                f"  ghosts={result['ghosts']}"
+                f"  wrong_class={result['wrong_class']}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
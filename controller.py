@@ -1,40 +1,58 @@
 import asyncio
+import time
 import cv2
 import numpy as np
-from PIL import ImageGrab
-import win32gui
 
 from ai.bot_ai import BotAI
 from ai.roles import Role
 from ai.types import HeroState, GameState
-from utils.input_simulator import InputSimulator
+from vision.feature_store import FrameFeatureStore
+from vision.tracker import UnitTracker
+from vision.unit_detector import detect_units, check_tracks
 
 
 class BotController:
-    def __init__(self, bot_id, window_handle):
+    def __init__(self, bot_id, window_handle, detect_interval=1, ai=None, clock=time.monotonic):
         self.bot_id = bot_id
         self.window_handle = window_handle
 
         self.hero_state = None
         self.game_state = None
 
-        self.ai = BotAI(bot_id, Role.CARRY)
+        # Общие для всех анализаторов признаки кадра (HSV, маски, ROI...)
+        self.features = FrameFeatureStore()
+
+        # Полная детекция юнитов раз в detect_interval кадров, между ними —
+        # предсказание трекера и проверка ROI. При тике раз в 0.5 с юниты за
+        # тик смещаются на десятки пикселей, и проверка ROI проигрывает полной
+        # детекции и по времени, и по точности (benchmarks/bench_tracker.py),
+        # поэтому по умолчанию детекция на каждом кадре
+        self.tracker = UnitTracker()
+        self.detect_interval = detect_interval
+        self.frame_count = 0
+        # Источник времени для трекера; симулятор подставляет игровое время
+        self.clock = clock
+
+        self.ai = ai if ai is not None else BotAI(bot_id, Role.CARRY)
         self.is_running = False
 
     async def capture_screen(self):
+        # Windows-зависимости импортируются здесь, чтобы контроллер
+        # можно было запускать в headless-симуляторе на Linux
+        import win32gui
+        from PIL import ImageGrab
+
         rect = win32gui.GetWindowRect(self.window_handle)
         x1, y1, x2, y2 = rect
         img = ImageGrab.grab(bbox=(x1, y1, x2, y2))
         return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
 
-    async def analyze_game_state(self, image):
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-
-        lower_red = np.array([0, 100, 100])
-        upper_red = np.array([10, 255, 255])
-        mask = cv2.inRange(hsv, lower_red, upper_red)
+    async def analyze_game_state(self, features):
+        lower_red = (0, 100, 100)
+        upper_red = (10, 255, 255)
+        mask = features.mask(lower_red, upper_red)
 
-        hp_percent = np.sum(mask > 0) / mask.size
+        hp_percent = cv2.countNonZero(mask) / mask.size
 
         self.hero_state = HeroState(
             hp=int(hp_percent * 1000),
@@ -47,23 +65,45 @@ class BotController:
             is_alive=hp_percent > 0
         )
 
+        units = self.track_units(features)
+
         self.game_state = GameState(
             time=0.0,
-            visible_units=[],
-            creeps_enemy=[],
-            creeps_ally=[],
-            heroes_enemy=[]
+            visible_units=units,
+            creeps_enemy=[u for u in units if u.is_enemy and not u.is_hero],
+            creeps_ally=[u for u in units if not u.is_enemy and not u.is_hero],
+            heroes_enemy=[u for u in units if u.is_enemy and u.is_hero]
         )
 
+    def track_units(self, features):
+        now = self.clock()
+        full_pass = self.frame_count % self.detect_interval == 0 or not self.tracker.tracks
+        self.frame_count += 1
+
+        if full_pass:
+            return self.tracker.update(detect_units(features), now)
+
+        predictions = self.tracker.predict(now)
+        return self.tracker.refine(check_tracks(features, predictions, now), now)
+
+    async def tick(self, image, input_sim):
+        self.features.begin_frame(image)
+        await self.analyze_game_state(self.features)
+
+        if self.hero_state and self.game_state:
+            self.ai.tick(self.hero_state, self.game_state, input_sim)
+
     async def run(self):
+        from utils.input_simulator import InputSimulator
+
         self.is_running = True
 
         while self.is_running:
             image = await self.capture_screen()
-            await self.analyze_game_state(image)
-
-            if self.hero_state and self.game_state:
-                sim = InputSimulator(self.window_handle)
-                self.ai.tick(self.hero_state, self.game_state, sim)
+            await self.tick(image, InputSimulator(self.window_handle))
 
             await asyncio.sleep(0.5)
+
+    def get_vision_stats(self):
+        """Статистика кеша признаков кадра (hit rate, байты за тик)"""
+        return self.features.get_stats()
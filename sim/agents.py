@@ -0,0 +1,121 @@
+# sim/agents.py
+"""
+Адаптеры ИИ к циклу симулятора: tick(hero_state, game_state, input_sim),
+тот же контракт, что BotController ожидает от self.ai.
+"""
+
+import math
+from typing import Tuple
+
+from ai.decision_engine import DecisionEngine
+from ai.my_bot_ai import MyBotAI
+from ai.tactics import Tactics
+from sim.world import NUKE_RANGE
+
+# Доля HP, ниже которой герой лечится способностью 'w'
+HEAL_HP = 0.5
+
+
+def cast_abilities(hero, position, game, input_sim, nuke_range: float = NUKE_RANGE):
+    """
+    Способности по hero.abilities_ready: 'w' (лечение) при HP ниже HEAL_HP,
+    'q' (урон ближайшему врагу), когда враг в радиусе nuke_range.
+    position — положение героя в тех же координатах, что и юниты.
+    """
+    if not hero.is_alive:
+        return
+
+    ready = hero.abilities_ready
+    if ready.get('w') and hero.hp < HEAL_HP * hero.max_hp:
+        input_sim.press_key('w')
+
+    enemies = game.heroes_enemy + game.creeps_enemy
+    if ready.get('q') and enemies:
+        hx, hy = position
+        if min(math.hypot(u.position[0] - hx, u.position[1] - hy) for u in enemies) <= nuke_range:
+            input_sim.press_key('q')
+
+
+class EngineAgent:
+    """
+    DecisionEngine + Tactics. nuke_range задаётся в координатах клика
+    (в режиме controller — в пикселях экрана).
+    """
+
+    def __init__(self, to_screen=None, nuke_range: float = NUKE_RANGE):
+        self.engine = DecisionEngine(to_screen=to_screen)
+        self.tactics = Tactics()
+        self.nuke_range = nuke_range
+        self._last_plan = None
+
+    def tick(self, hero, game, input_sim):
+        cast_abilities(hero, self.engine.click_position(hero.position), game, input_sim, self.nuke_range)
+
+        action, target = self.engine.decide(hero, game)
+        # Попадание в кеш возвращает тот же объект плана — команду не повторяем
+        plan = self.engine.last_plan
+        if plan is not None and plan is self._last_plan:
+            return
+        self._last_plan = plan
+
+        if target is not None:
+            self.tactics.execute(action, target, input_sim)
+
+
+class MyBotAgent:
+    """
+    MyBotAI: HeroState/GameState переводятся в словарь game_state,
+    а решение-словарь — в клики по целям из GameState.
+    """
+
+    def __init__(self, bot_id: int, fountain: Tuple[int, int]):
+        self.ai = MyBotAI(bot_id)
+        self.fountain = fountain
+        self.ai.start()
+        self._last_action = None
+
+    def tick(self, hero, game, input_sim):
+        # Одна и та же цель идёт и в сигнатуру решения, и в клик
+        target = self._target(hero, game)
+        self.ai.update_game_state({
+            "hero_hp": hero.hp / hero.max_hp if hero.max_hp else 0.0,
+            "enemies_visible": len(game.heroes_enemy),
+            "creeps_visible": len(game.creeps_enemy),
+            "target_id": target.unit_id if target is not None else None
+        })
+        cast_abilities(hero, hero.position, game, input_sim)
+
+        action = self.ai.make_decision()
+        # Попадание в кеш возвращает тот же объект решения — команду не повторяем
+        if action is self._last_action:
+            return
+        self._last_action = action
+
+        self.ai.execute_action(action)
+
+        point = self._resolve_point(action, target)
+        if point is not None:
+            input_sim.move_mouse(*point)
+            input_sim.right_click()
+
+    def _target(self, hero, game):
+        """Ближайший вражеский герой, а если их нет — ближайший вражеский крип"""
+        units = game.heroes_enemy or game.creeps_enemy
+        if not units:
+            return None
+
+        hx, hy = hero.position
+        return min(units, key=lambda u: (u.position[0] - hx) ** 2 + (u.position[1] - hy) ** 2)
+
+    def _resolve_point(self, action, target):
+        kind = action.get("action")
+
+        if kind == "retreat":
+            return self.fountain
+        if kind == "attack" and target is not None and target.is_hero:
+            return target.position
+        if kind == "farm" and target is not None and not target.is_hero:
+            return target.position
+        if kind == "move":
+            return action.get("target_x", 3000), action.get("target_y", 3000)
+        return None
@@ -0,0 +1,38 @@
+# sim/input.py
+"""
+Замена utils.input_simulator.InputSimulator для симулятора.
+Команды мыши и клавиатуры превращаются в приказы герою в SimWorld.
+"""
+
+from typing import Callable, Optional, Tuple
+
+from sim.world import SimWorld
+
+
+class SimInputSimulator:
+    """
+    Интерфейс совместим с InputSimulator (move_mouse / right_click / ...).
+    to_world переводит координаты курсора в координаты мира; без него
+    курсор считается уже заданным в мировых координатах.
+    """
+
+    def __init__(self, world: SimWorld, hero: int,
+                 to_world: Optional[Callable[[float, float], Tuple[float, float]]] = None):
+        self.world = world
+        self.hero = hero
+        self.to_world = to_world
+        self.cursor = (0, 0)
+
+    def move_mouse(self, x, y):
+        self.cursor = (x, y)
+
+    def right_click(self):
+        x, y = self.cursor
+        point = self.to_world(x, y) if self.to_world else (x, y)
+        self.world.command(self.hero, point)
+
+    def left_click(self):
+        pass
+
+    def press_key(self, key):
+        self.world.cast(self.hero, key)
@@ -0,0 +1,104 @@
+# sim/render.py
+"""
+Синтетические кадры для vision-анализаторов.
+
+Камера центрирована на герое, над юнитами рисуются полоски HP тех же
+цветов, что ищет vision.unit_detector (враги — красные, союзники — зелёные).
+Как в игре, заполненная часть полоски слева, пустая — тёмная, а полоски
+героев выше полосок крипов.
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from sim.world import SimWorld
+
+
+ENEMY_BAR = (0, 0, 230)     # BGR
+ALLY_BAR = (0, 200, 0)
+EMPTY_BAR = (10, 10, 10)
+BACKGROUND = 40
+
+HERO_BAR_WIDTH = 60
+CREEP_BAR_WIDTH = 24
+HERO_BAR_HEIGHT = 8
+CREEP_BAR_HEIGHT = 4
+
+
+def draw_hp_bar(frame: np.ndarray, x: int, y: int, width: int, height: int,
+                fill: float, color: Tuple[int, int, int]):
+    """Полоска HP с центром (x, y); fill — доля HP (0..1)"""
+    x1, y1 = x - width // 2, y - height // 2
+    x2, y2 = x1 + width - 1, y1 + height - 1
+    cv2.rectangle(frame, (x1, y1), (x2, y2), EMPTY_BAR, -1)
+
+    filled = int(round(width * min(max(fill, 0.0), 1.0)))
+    if filled > 0:
+        cv2.rectangle(frame, (x1, y1), (x1 + filled - 1, y2), color, -1)
+
+
+class Camera:
+    """Преобразование координат мир <-> экран для камеры над героем"""
+
+    def __init__(self, world: SimWorld, hero: int, width: int = 640, height: int = 360,
+                 view_width: float = 1600.0):
+        self.world = world
+        self.hero = hero
+        self.width = width
+        self.height = height
+        self.scale = width / view_width
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.width // 2, self.height // 2
+
+    def to_screen(self, points: np.ndarray) -> np.ndarray:
+        cx, cy = self.center
+        return (points - self.world.pos[self.hero]) * self.scale + (cx, cy)
+
+    def world_to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        cx, cy = self.center
+        hx, hy = self.world.pos[self.hero]
+        return int(cx + (x - hx) * self.scale), int(cy + (y - hy) * self.scale)
+
+    def to_world(self, x: float, y: float) -> Tuple[float, float]:
+        cx, cy = self.center
+        hx, hy = self.world.pos[self.hero]
+        return hx + (x - cx) / self.scale, hy + (y - cy) / self.scale
+
+
+class FrameRenderer:
+    """Рисует кадр героя в переиспользуемый буфер"""
+
+    def __init__(self, camera: Camera):
+        self.camera = camera
+        self.frame = np.empty((camera.height, camera.width, 3), dtype=np.uint8)
+
+    def render(self) -> np.ndarray:
+        world = self.camera.world
+        hero = self.camera.hero
+        frame = self.frame
+        frame.fill(BACKGROUND)
+
+        if not world.alive[hero]:
+            return frame
+
+        slots = world.visible(hero)
+        screen = self.camera.to_screen(world.pos[slots]).astype(np.int32)
+        team = world.team[hero]
+
+        for slot, (x, y) in zip(slots.tolist(), screen.tolist()):
+            if not (0 <= x < self.camera.width and 0 <= y < self.camera.height):
+                continue
+
+            if world.is_hero[slot]:
+                width, height = HERO_BAR_WIDTH, HERO_BAR_HEIGHT
+            else:
+                width, height = CREEP_BAR_WIDTH, CREEP_BAR_HEIGHT
+            color = ENEMY_BAR if world.team[slot] != team else ALLY_BAR
+            fill = world.hp[slot] / world.max_hp[slot]
+            draw_hp_bar(frame, x, y, width, height, fill, color)
+
+        return frame
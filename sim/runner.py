@@ -0,0 +1,166 @@
+# sim/runner.py
+"""
+Прогон многих ботов в одном процессе быстрее реального времени.
+
+Режимы ботов:
+    engine     — DecisionEngine + Tactics, состояние напрямую из модели
+    mybot      — MyBotAI, состояние напрямую из модели
+    controller — BotController: синтетические кадры -> vision -> DecisionEngine
+
+Скорость при 20 ботах: engine/mybot — порядка 150-200x реального времени,
+controller — около 13-15x при кадре 640x360 и 40-45x при 320x180. В режиме
+controller каждый тик считает HSV, маски и полную детекцию юнитов по всему
+кадру, поэтому его скорость ограничена числом пикселей, и 100x он не достигает.
+
+Запуск:
+    python -m sim.runner --bots 20 --duration 600 --agent engine --speed 100
+    python -m sim.runner --bots 20 --duration 300 --agent controller --frame-width 320
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from controller import BotController
+from sim.agents import EngineAgent, MyBotAgent
+from sim.input import SimInputSimulator
+from sim.render import Camera, FrameRenderer
+from sim.world import NUKE_RANGE, SimWorld
+
+
+class StateBot:
+    """Бот, получающий HeroState/GameState напрямую из модели"""
+
+    def __init__(self, world: SimWorld, hero: int, agent):
+        self.world = world
+        self.hero = hero
+        self.agent = agent
+        self.input = SimInputSimulator(world, hero)
+
+    async def step(self):
+        hero, game = self.world.observe(self.hero)
+        self.agent.tick(hero, game, self.input)
+
+
+class SimBotController(BotController):
+    """
+    BotController, который смотрит на синтетические кадры вместо окна игры.
+    HUD героя не рисуется, поэтому HeroState (в координатах мира) берётся
+    из модели. Юниты приходят из vision в пикселях экрана, а собственные цели
+    DecisionEngine переводятся из мира в экран камерой — решения те же,
+    что в режиме engine.
+    """
+
+    def __init__(self, world: SimWorld, hero: int, frame_size=(640, 360), **kwargs):
+        camera = Camera(world, hero, width=frame_size[0], height=frame_size[1])
+        super().__init__(
+            hero, None,
+            ai=EngineAgent(to_screen=camera.world_to_screen, nuke_range=NUKE_RANGE * camera.scale),
+            clock=lambda: world.time,
+            **kwargs
+        )
+        self.world = world
+        self.hero = hero
+        self.camera = camera
+        self.renderer = FrameRenderer(self.camera)
+        self.input = SimInputSimulator(world, hero, to_world=self.camera.to_world)
+
+    async def capture_screen(self):
+        return self.renderer.render()
+
+    async def analyze_game_state(self, features):
+        await super().analyze_game_state(features)
+        self.hero_state = self.world.hero_state(self.hero)
+        self.game_state.time = self.world.time
+
+    async def step(self):
+        await self.tick(await self.capture_screen(), self.input)
+
+
+class SimRunner:
+    def __init__(self, num_bots: int = 20, agent: str = "engine", tick_interval: float = 0.5,
+                 dt: float = 0.1, speed: Optional[float] = None, seed: int = 0,
+                 frame_size=(640, 360)):
+        self.world = SimWorld(num_heroes=num_bots, seed=seed)
+        # Размер синтетического кадра для режима controller
+        self.frame_size = frame_size
+        self.tick_interval = tick_interval
+        self.dt = dt
+        # Целевое ускорение относительно реального времени; None — максимально быстро
+        self.speed = speed
+
+        self.bots = [self._make_bot(agent, hero) for hero in range(num_bots)]
+        self.tick_time = 0.0
+        self.ticks = 0
+
+    def _make_bot(self, agent: str, hero: int):
+        if agent == "engine":
+            return StateBot(self.world, hero, EngineAgent())
+        if agent == "mybot":
+            return StateBot(self.world, hero, MyBotAgent(hero, self.world.fountain(hero)))
+        if agent == "controller":
+            return SimBotController(self.world, hero, frame_size=self.frame_size)
+        raise ValueError(f"Неизвестный тип агента: {agent}")
+
+    async def _step_bots(self):
+        for bot in self.bots:
+            await bot.step()
+
+    async def _run(self, duration: float):
+        steps_per_tick = max(1, round(self.tick_interval / self.dt))
+        start = time.perf_counter()
+
+        while self.world.time < duration:
+            tick_start = time.perf_counter()
+            await self._step_bots()
+            self.tick_time += time.perf_counter() - tick_start
+            self.ticks += 1
+
+            for _ in range(steps_per_tick):
+                self.world.step(self.dt)
+
+            if self.speed:
+                ahead = self.world.time / self.speed - (time.perf_counter() - start)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+
+        return time.perf_counter() - start
+
+    def run(self, duration: float) -> Dict[str, Any]:
+        """Прогнать duration секунд игрового времени, вернуть статистику"""
+        wall = asyncio.run(self._run(duration))
+        bot_ticks = self.ticks * len(self.bots)
+
+        return {
+            'bots': len(self.bots),
+            'game_time': self.world.time,
+            'wall_time': wall,
+            'speedup': self.world.time / wall if wall else 0.0,
+            'bot_ticks': bot_ticks,
+            'avg_bot_tick_ms': 1000 * self.tick_time / bot_ticks if bot_ticks else 0.0,
+            **self.world.stats
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless Dota 2 bot simulator")
+    ap.add_argument("--bots", type=int, default=20)
+    ap.add_argument("--duration", type=float, default=600.0, help="game seconds")
+    ap.add_argument("--agent", choices=["engine", "mybot", "controller"], default="engine")
+    ap.add_argument("--speed", type=float, default=None, help="target speed-up (default: unlimited)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--frame-width", type=int, default=640, help="controller frame width (16:9)")
+    args = ap.parse_args()
+
+    frame_size = (args.frame_width, args.frame_width * 9 // 16)
+    runner = SimRunner(num_bots=args.bots, agent=args.agent, speed=args.speed, seed=args.seed,
+                       frame_size=frame_size)
+    stats = runner.run(args.duration)
+
+    for key, value in stats.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+# sim/world.py
+"""
+Headless-модель матча: лайны, волны крипов, герои с HP/маной и простой бой.
+
+Все юниты хранятся в numpy-массивах (structure of arrays), шаг мира
+векторизован — это позволяет крутить десятки героев и сотни крипов
+во много раз быстрее реального времени.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from ai.types import Unit, HeroState, GameState
+
+
+MAP_SIZE = 16000.0
+
+RADIANT, DIRE = 0, 1
+FOUNTAINS = np.array([(600.0, 600.0), (15400.0, 15400.0)], dtype=np.float32)
+
+# Лайны от базы Radiant к базе Dire: top / mid / bot
+LANE_POINTS = np.array([
+    [(1500, 1500), (1500, 14500), (14500, 14500)],
+    [(1500, 1500), (8000, 8000), (14500, 14500)],
+    [(1500, 1500), (14500, 1500), (14500, 14500)],
+], dtype=np.float32)
+# Dire идёт по тем же точкам в обратном порядке: [team, lane, point]
+LANE_WAYPOINTS = np.stack([LANE_POINTS, LANE_POINTS[:, ::-1]])
+
+WAVE_INTERVAL = 30.0
+CREEPS_PER_WAVE = 4
+CREEP_STATS = {'hp': 550, 'damage': 20, 'range': 100, 'speed': 325, 'period': 1.0}
+HERO_STATS = {'hp': 600, 'mana': 300, 'damage': 50, 'range': 150, 'speed': 300, 'period': 1.0}
+
+AGGRO_RANGE = 500.0
+VISION_RANGE = 1200.0
+CLICK_RADIUS = 150.0
+WAYPOINT_RADIUS = 50.0
+
+RESPAWN_TIME = 10.0
+FOUNTAIN_RADIUS = 1000.0
+HP_REGEN = 2.0
+MANA_REGEN = 1.5
+FOUNTAIN_REGEN = 0.05   # доля max_hp/max_mana в секунду
+
+XP_RANGE = 1200.0
+XP_CREEP = 40
+XP_HERO = 200
+XP_PER_LEVEL = 200
+MAX_LEVEL = 25
+
+# Способности: ключ -> (стоимость маны, кулдаун, значение)
+ABILITIES = {
+    'q': (100, 8.0, 150),    # урон ближайшему врагу в радиусе 600
+    'w': (100, 15.0, 150),   # лечение себя
+}
+NUKE_RANGE = 600.0
+
+
+class SimWorld:
+    """Состояние матча и его пошаговая симуляция"""
+
+    def __init__(self, num_heroes: int = 10, capacity: int = 512, seed: int = 0):
+        self.time = 0.0
+        self.num_heroes = num_heroes
+        self.rng = np.random.default_rng(seed)
+        self._next_wave = 0.0
+        self._next_uid = 0
+
+        self._allocate(max(capacity, num_heroes * 2))
+
+        # Слоты 0..num_heroes-1 закреплены за героями, команды чередуются
+        for slot in range(num_heroes):
+            team = slot % 2
+            self._spawn(slot, team, is_hero=True, lane=-1)
+
+        self.stats = {
+            'steps': 0,
+            'creeps_spawned': 0,
+            'creeps_killed': 0,
+            'hero_deaths': 0,
+            'commands': 0,
+            'casts': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Хранилище
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.used = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.uid = np.zeros(capacity, dtype=np.int64)
+        self.team = np.zeros(capacity, dtype=np.int8)
+        self.is_hero = np.zeros(capacity, dtype=bool)
+        self.lane = np.full(capacity, -1, dtype=np.int8)
+        self.waypoint = np.zeros(capacity, dtype=np.int8)
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.hp = np.zeros(capacity, dtype=np.float32)
+        self.max_hp = np.zeros(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.attack_range = np.zeros(capacity, dtype=np.float32)
+        self.speed = np.zeros(capacity, dtype=np.float32)
+        self.period = np.ones(capacity, dtype=np.float32)
+        self.cooldown = np.zeros(capacity, dtype=np.float32)
+
+        # Приказы героев: движение в точку или атака юнита (слот)
+        self.has_move = np.zeros(capacity, dtype=bool)
+        self.move_target = np.zeros((capacity, 2), dtype=np.float32)
+        self.attack_target = np.full(capacity, -1, dtype=np.int32)
+
+        # Только для героев
+        n = self.num_heroes
+        self.mana = np.zeros(n, dtype=np.float32)
+        self.max_mana = np.zeros(n, dtype=np.float32)
+        self.level = np.ones(n, dtype=np.int32)
+        self.xp = np.zeros(n, dtype=np.int32)
+        self.respawn_at = np.zeros(n, dtype=np.float32)
+        self.ability_cd = {key: np.zeros(n, dtype=np.float32) for key in ABILITIES}
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in (
+            'used', 'alive', 'uid', 'team', 'is_hero', 'lane', 'waypoint',
+            'pos', 'hp', 'max_hp', 'damage', 'attack_range', 'speed', 'period',
+            'cooldown', 'has_move', 'move_target', 'attack_target'
+        )}
+        hero_state = {name: getattr(self, name) for name in (
+            'mana', 'max_mana', 'level', 'xp', 'respawn_at', 'ability_cd'
+        )}
+
+        self._allocate(self.capacity * 2)
+        for name, arr in old.items():
+            getattr(self, name)[:len(arr)] = arr
+        for name, value in hero_state.items():
+            setattr(self, name, value)
+
+    def _spawn(self, slot: int, team: int, is_hero: bool, lane: int):
+        stats = HERO_STATS if is_hero else CREEP_STATS
+
+        self.used[slot] = True
+        self.alive[slot] = True
+        self.uid[slot] = self._next_uid
+        self._next_uid += 1
+
+        self.team[slot] = team
+        self.is_hero[slot] = is_hero
+        self.lane[slot] = lane
+        self.waypoint[slot] = 1
+
+        self.max_hp[slot] = stats['hp']
+        self.hp[slot] = stats['hp']
+        self.damage[slot] = stats['damage']
+        self.attack_range[slot] = stats['range']
+        self.speed[slot] = stats['speed']
+        self.period[slot] = stats['period']
+        self.cooldown[slot] = 0.0
+
+        self.has_move[slot] = False
+        self.attack_target[slot] = -1
+
+        if is_hero:
+            self.pos[slot] = FOUNTAINS[team]
+            self.max_mana[slot] = stats['mana']
+            self.mana[slot] = stats['mana']
+        else:
+            # Небольшой разброс, чтобы крипы волны не стояли в одной точке
+            self.pos[slot] = LANE_WAYPOINTS[team, lane, 0] + self.rng.uniform(-60, 60, 2)
+
+    def _spawn_wave(self):
+        for team in (RADIANT, DIRE):
+            for lane in range(3):
+                for _ in range(CREEPS_PER_WAVE):
+                    free = np.flatnonzero(~self.used[self.num_heroes:])
+                    if not len(free):
+                        self._grow()
+                        free = np.flatnonzero(~self.used[self.num_heroes:])
+                    self._spawn(self.num_heroes + free[0], team, is_hero=False, lane=lane)
+                    self.stats['creeps_spawned'] += 1
+
+    # ------------------------------------------------------------------
+    # Команды
+
+    def command(self, hero: int, point: Tuple[float, float]):
+        """ПКМ в точку: атака врага под курсором или движение"""
+        if not self.alive[hero]:
+            return
+        self.stats['commands'] += 1
+
+        p = np.clip(np.asarray(point, dtype=np.float32), 0, MAP_SIZE)
+        candidates = np.flatnonzero(self.alive & (self.team != self.team[hero]))
+        if len(candidates):
+            dist = np.linalg.norm(self.pos[candidates] - p, axis=1)
+            best = dist.argmin()
+            if dist[best] <= CLICK_RADIUS:
+                self.attack_target[hero] = candidates[best]
+                self.has_move[hero] = False
+                return
+
+        self.attack_target[hero] = -1
+        self.has_move[hero] = True
+        self.move_target[hero] = p
+
+    def cast(self, hero: int, key: str) -> bool:
+        """Применить способность героя"""
+        if key not in ABILITIES or not self.alive[hero]:
+            return False
+
+        cost, cooldown, value = ABILITIES[key]
+        if self.mana[hero] < cost or self.ability_cd[key][hero] > 0:
+            return False
+
+        if key == 'q':
+            candidates = np.flatnonzero(self.alive & (self.team != self.team[hero]))
+            if not len(candidates):
+                return False
+            dist = np.linalg.norm(self.pos[candidates] - self.pos[hero], axis=1)
+            best = dist.argmin()
+            if dist[best] > NUKE_RANGE:
+                return False
+            self.hp[candidates[best]] -= value
+        else:
+            self.hp[hero] = min(self.max_hp[hero], self.hp[hero] + value)
+
+        self.mana[hero] -= cost
+        self.ability_cd[key][hero] = cooldown
+        self.stats['casts'] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Симуляция
+
+    def step(self, dt: float):
+        """Продвинуть мир на dt секунд игрового времени"""
+        if self.time >= self._next_wave:
+            self._spawn_wave()
+            self._next_wave += WAVE_INTERVAL
+
+        idx = np.flatnonzero(self.alive)
+        if len(idx):
+            self._combat_and_movement(idx, dt)
+
+        self._resolve_deaths()
+        self._regen_and_respawn(dt)
+
+        self.time += dt
+        self.stats['steps'] += 1
+
+    def _combat_and_movement(self, idx: np.ndarray, dt: float):
+        n = len(idx)
+        ar = np.arange(n)
+        pos = self.pos[idx]
+        team = self.team[idx]
+        is_hero = self.is_hero[idx]
+
+        diff = pos[:, None, :] - pos[None, :, :]
+        dist = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+        dist_enemy = np.where(team[:, None] != team[None, :], dist, np.inf)
+        nearest = dist_enemy.argmin(axis=1)
+        nearest_d = dist_enemy[ar, nearest]
+
+        # Глобальный слот -> локальный индекс
+        g2l = np.full(self.capacity, -1, dtype=np.int64)
+        g2l[idx] = ar
+
+        target = np.full(n, -1, dtype=np.int64)
+
+        # Крипы и свободные герои атакуют ближайшего врага в радиусе
+        creep_aggro = ~is_hero & (nearest_d <= AGGRO_RANGE)
+        target[creep_aggro] = nearest[creep_aggro]
+
+        ordered = self.attack_target[idx]
+        ordered_local = np.where(ordered >= 0, g2l[np.maximum(ordered, 0)], -1)
+        hero_attack = is_hero & (ordered_local >= 0)
+        target[hero_attack] = ordered_local[hero_attack]
+
+        # Цель приказа погибла — приказ снимаем
+        lost = is_hero & (ordered >= 0) & (ordered_local < 0)
+        self.attack_target[idx[lost]] = -1
+
+        has_move = self.has_move[idx]
+        hero_idle = is_hero & ~hero_attack & ~has_move & (nearest_d <= self.attack_range[idx])
+        target[hero_idle] = nearest[hero_idle]
+
+        has_target = target >= 0
+        safe_target = np.maximum(target, 0)
+        target_d = np.where(has_target, dist[ar, safe_target], np.inf)
+        in_range = has_target & (target_d <= self.attack_range[idx])
+
+        # Атака
+        cooldown = self.cooldown[idx] - dt
+        hits = in_range & (cooldown <= 0)
+        hp_delta = np.zeros(n, dtype=np.float32)
+        np.add.at(hp_delta, target[hits], self.damage[idx[hits]])
+        cooldown[hits] = self.period[idx[hits]]
+        self.cooldown[idx] = np.maximum(cooldown, 0)
+        self.hp[idx] -= hp_delta
+
+        # Цели движения
+        goal = pos.copy()
+        moving = np.zeros(n, dtype=bool)
+
+        chase = has_target & ~in_range
+        goal[chase] = pos[safe_target[chase]]
+        moving |= chase
+
+        walk = ~is_hero & ~has_target
+        if walk.any():
+            slots = idx[walk]
+            wp = LANE_WAYPOINTS[self.team[slots], self.lane[slots], self.waypoint[slots]]
+            reached = np.linalg.norm(wp - pos[walk], axis=1) <= WAYPOINT_RADIUS
+            self.waypoint[slots[reached]] = np.minimum(self.waypoint[slots[reached]] + 1, 2)
+            goal[walk] = LANE_WAYPOINTS[self.team[slots], self.lane[slots], self.waypoint[slots]]
+            moving |= walk
+
+        go = is_hero & ~has_target & has_move
+        goal[go] = self.move_target[idx[go]]
+        moving |= go
+
+        delta = goal - pos
+        length = np.linalg.norm(delta, axis=1)
+        step = np.minimum(self.speed[idx] * dt, length)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            direction = np.where(length[:, None] > 0, delta / length[:, None], 0)
+        pos = pos + direction * (step * moving)[:, None]
+        self.pos[idx] = pos
+
+        arrived = go & (length <= self.speed[idx] * dt)
+        self.has_move[idx[arrived]] = False
+
+    def _resolve_deaths(self):
+        died = np.flatnonzero(self.alive & (self.hp <= 0))
+        if not len(died):
+            return
+
+        self.alive[died] = False
+        heroes = np.flatnonzero(self.alive[:self.num_heroes])
+
+        for slot in died:
+            # Опыт живым героям противника поблизости
+            if len(heroes):
+                near = heroes[
+                    (self.team[heroes] != self.team[slot]) &
+                    (np.linalg.norm(self.pos[heroes] - self.pos[slot], axis=1) <= XP_RANGE)
+                ]
+                self.xp[near] += XP_HERO if self.is_hero[slot] else XP_CREEP
+
+            if self.is_hero[slot]:
+                self.respawn_at[slot] = self.time + RESPAWN_TIME
+                self.has_move[slot] = False
+                self.attack_target[slot] = -1
+                self.stats['hero_deaths'] += 1
+            else:
+                self.used[slot] = False
+                self.stats['creeps_killed'] += 1
+
+        self._level_up()
+
+    def _level_up(self):
+        level = np.minimum(1 + self.xp // XP_PER_LEVEL, MAX_LEVEL)
+        gained = level - self.level
+        if not gained.any():
+            return
+
+        slots = np.flatnonzero(gained)
+        self.level[slots] = level[slots]
+        self.max_hp[slots] += 40 * gained[slots]
+        self.hp[slots] += 40 * gained[slots]
+        self.damage[slots] += 4 * gained[slots]
+        self.max_mana[slots] += 20 * gained[slots]
+
+    def _regen_and_respawn(self, dt: float):
+        n = self.num_heroes
+
+        respawn = np.flatnonzero(~self.alive[:n] & (self.time >= self.respawn_at))
+        for slot in respawn:
+            self.alive[slot] = True
+            self.hp[slot] = self.max_hp[slot]
+            self.mana[slot] = self.max_mana[slot]
+            self.pos[slot] = FOUNTAINS[self.team[slot]]
+
+        alive = self.alive[:n]
+        at_fountain = np.linalg.norm(self.pos[:n] - FOUNTAINS[self.team[:n]], axis=1) <= FOUNTAIN_RADIUS
+        max_hp = self.max_hp[:n]
+
+        hp_regen = HP_REGEN + at_fountain * FOUNTAIN_REGEN * max_hp
+        mana_regen = MANA_REGEN + at_fountain * FOUNTAIN_REGEN * self.max_mana
+        self.hp[:n] = np.where(alive, np.minimum(self.hp[:n] + hp_regen * dt, max_hp), self.hp[:n])
+        self.mana[:] = np.where(alive, np.minimum(self.mana + mana_regen * dt, self.max_mana), self.mana)
+
+        for cd in self.ability_cd.values():
+            np.maximum(cd - dt, 0, out=cd)
+
+    # ------------------------------------------------------------------
+    # Наблюдения
+
+    def visible(self, hero: int, radius: float = VISION_RANGE) -> np.ndarray:
+        """Слоты живых юнитов в радиусе обзора героя (без самого героя)"""
+        idx = np.flatnonzero(self.alive)
+        idx = idx[idx != hero]
+        dist = np.linalg.norm(self.pos[idx] - self.pos[hero], axis=1)
+        return idx[dist <= radius]
+
+    def hero_state(self, hero: int) -> HeroState:
+        mana = self.mana[hero]
+        abilities = {
+            key: bool(mana >= cost and self.ability_cd[key][hero] <= 0)
+            for key, (cost, _, _) in ABILITIES.items()
+        }
+
+        x, y = self.pos[hero]
+
+        return HeroState(
+            hp=int(max(self.hp[hero], 0)),
+            max_hp=int(self.max_hp[hero]),
+            mana=int(mana),
+            level=int(self.level[hero]),
+            position=(int(x), int(y)),
+            abilities_ready=abilities,
+            items_ready={},
+            is_alive=bool(self.alive[hero])
+        )
+
+    def observe(self, hero: int) -> Tuple[HeroState, GameState]:
+        """HeroState/GameState героя напрямую из модели (без зрения)"""
+        team = self.team[hero]
+        units: List[Unit] = []
+
+        if self.alive[hero]:
+            for slot in self.visible(hero):
+                x, y = self.pos[slot]
+                is_hero = bool(self.is_hero[slot])
+                units.append(Unit(
+                    name=f"hero_{slot}" if is_hero else "creep",
+                    hp=int(self.hp[slot]),
+                    max_hp=int(self.max_hp[slot]),
+                    position=(int(x), int(y)),
+                    is_enemy=bool(self.team[slot] != team),
+                    is_hero=is_hero,
+                    unit_id=int(self.uid[slot])
+                ))
+
+        game = GameState(
+            time=self.time,
+            visible_units=units,
+            creeps_enemy=[u for u in units if u.is_enemy and not u.is_hero],
+            creeps_ally=[u for u in units if not u.is_enemy and not u.is_hero],
+            heroes_enemy=[u for u in units if u.is_enemy and u.is_hero]
+        )
+        return self.hero_state(hero), game
+
+    def fountain(self, hero: int) -> Tuple[int, int]:
+        x, y = FOUNTAINS[self.team[hero]]
+        return int(x), int(y)
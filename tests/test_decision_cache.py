@@ -0,0 +1,243 @@
+from ai.decision_cache import DecisionCache, ModeHysteresis
+from ai.decision_engine import Action, DecisionEngine
+from ai.types import Unit, HeroState, GameState
+from sim.agents import EngineAgent, MyBotAgent
+
+
+def make_hero(hp=1000, position=(5000, 5000)):
+    return HeroState(
+        hp=hp,
+        max_hp=1000,
+        mana=300,
+        level=1,
+        position=position,
+        abilities_ready={},
+        items_ready={},
+        is_alive=True
+    )
+
+
+def make_game(enemies=(), creeps=()):
+    units = list(enemies) + list(creeps)
+    return GameState(
+        time=0.0,
+        visible_units=units,
+        creeps_enemy=list(creeps),
+        creeps_ally=[],
+        heroes_enemy=list(enemies)
+    )
+
+
+def make_enemy(unit_id=1, position=(5100, 5000)):
+    return Unit("hero", 600, 600, position, is_enemy=True, is_hero=True, unit_id=unit_id)
+
+
+class FakeInput:
+    def __init__(self):
+        self.clicks = []
+        self.cursor = None
+
+    def move_mouse(self, x, y):
+        self.cursor = (x, y)
+
+    def right_click(self):
+        self.clicks.append(self.cursor)
+
+
+# ----------------------------------------------------------------------
+# ModeHysteresis
+
+def test_retreat_entered_below_enter_threshold():
+    modes = ModeHysteresis()
+    assert modes.update(0.31, 0, 0) == "idle"
+    assert modes.update(0.29, 0, 0) == "retreat"
+
+
+def test_retreat_kept_until_exit_threshold():
+    modes = ModeHysteresis()
+    modes.update(0.2, 0, 0)
+
+    assert modes.update(0.35, 0, 0) == "retreat"
+    assert modes.update(0.44, 1, 0) == "retreat"
+    assert modes.update(0.45, 1, 0) == "fight"
+
+
+def test_downgrade_waits_grace_ticks():
+    modes = ModeHysteresis(grace_ticks=3)
+    modes.update(1.0, 1, 0)
+
+    for _ in range(3):
+        assert modes.update(1.0, 0, 0) == "fight"
+    assert modes.update(1.0, 0, 0) == "idle"
+
+
+def test_upgrade_is_immediate():
+    modes = ModeHysteresis()
+    assert modes.update(1.0, 0, 1) == "farm"
+    assert modes.update(1.0, 1, 1) == "fight"
+
+
+def test_grace_resets_when_trigger_returns():
+    modes = ModeHysteresis(grace_ticks=3)
+    modes.update(1.0, 1, 0)
+
+    modes.update(1.0, 0, 0)
+    modes.update(1.0, 0, 0)
+    assert modes.update(1.0, 1, 0) == "fight"
+
+    # Счётчик начался заново: снова нужно 3 тика без врагов
+    for _ in range(3):
+        assert modes.update(1.0, 0, 0) == "fight"
+    assert modes.update(1.0, 0, 0) == "idle"
+
+
+# ----------------------------------------------------------------------
+# DecisionCache
+
+def test_lru_evicts_least_recently_used():
+    cache = DecisionCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_hits_and_misses_written_to_stats():
+    stats = {}
+    cache = DecisionCache(stats=stats)
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+
+    assert stats == {'decision_cache_hits': 1, 'decision_cache_misses': 1}
+
+
+def test_engine_reports_cache_stats():
+    engine = DecisionEngine()
+    hero, game = make_hero(), make_game()
+    engine.decide(hero, game)
+    engine.decide(hero, game)
+
+    assert engine.performance_stats['decision_cache_misses'] == 1
+    assert engine.performance_stats['decision_cache_hits'] == 1
+
+
+def test_my_bot_ai_reports_cache_stats(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from ai.my_bot_ai import MyBotAI
+
+    ai = MyBotAI(0)
+    ai.update_game_state({"hero_hp": 0.9, "enemies_visible": 0, "creeps_visible": 2})
+    first = ai.make_decision()
+    ai.update_game_state({"hero_hp": 0.92, "enemies_visible": 0, "creeps_visible": 3})
+
+    assert ai.make_decision() is first
+    assert ai.performance_stats['decision_cache_misses'] == 1
+    assert ai.performance_stats['decision_cache_hits'] == 1
+
+
+# ----------------------------------------------------------------------
+# DecisionEngine
+
+def test_cached_attack_uses_current_target_position():
+    engine = DecisionEngine()
+    hero = make_hero()
+    engine.decide(hero, make_game(enemies=[make_enemy(position=(5100, 5000))]))
+
+    action, target = engine.decide(hero, make_game(enemies=[make_enemy(position=(5400, 5300))]))
+    assert action == Action.ATTACK
+    assert target == (5400, 5300)
+    assert engine.performance_stats['decision_cache_hits'] == 1
+
+
+def test_mode_held_without_target_moves_to_lane():
+    engine = DecisionEngine()
+    hero = make_hero()
+    engine.decide(hero, make_game(enemies=[make_enemy()]))
+
+    # Режим держится гистерезисом, но цели больше нет — идём на лайн
+    action, target = engine.decide(hero, make_game())
+    assert engine.modes.mode == "fight"
+    assert action == Action.MOVE
+    assert target == engine.lane_position()
+
+
+def test_target_held_while_visible():
+    engine = DecisionEngine()
+    hero = make_hero()
+    engine.decide(hero, make_game(enemies=[make_enemy(1), make_enemy(2, (5300, 5000))]))
+
+    # Порядок видимых юнитов сменился, цель прошлого плана всё ещё видна
+    action, target = engine.decide(hero, make_game(enemies=[
+        make_enemy(2, (5300, 5000)),
+        make_enemy(1, (5150, 5050))
+    ]))
+    assert action == Action.ATTACK
+    assert target == (5150, 5050)
+
+
+# ----------------------------------------------------------------------
+# EngineAgent
+
+def test_agent_skips_repeated_cached_plan():
+    agent = EngineAgent()
+    sim = FakeInput()
+    hero, game = make_hero(), make_game()
+
+    agent.tick(hero, game, sim)
+    agent.tick(hero, game, sim)
+    assert len(sim.clicks) == 1
+
+
+def test_agent_reissues_when_plan_changes():
+    agent = EngineAgent()
+    sim = FakeInput()
+    hero = make_hero()
+
+    agent.tick(hero, make_game(), sim)
+    agent.tick(hero, make_game(enemies=[make_enemy()]), sim)
+    agent.tick(hero, make_game(enemies=[make_enemy()]), sim)
+
+    assert sim.clicks == [(3000, 3000), (5100, 5000)]
+
+
+def test_agent_retreat_clicks_away_from_hero():
+    agent = EngineAgent()
+    sim = FakeInput()
+    agent.tick(make_hero(hp=200), make_game(), sim)
+
+    assert sim.clicks == [(4600, 5000)]
+
+
+# ----------------------------------------------------------------------
+# MyBotAgent
+
+def test_my_bot_agent_clicks_nearest_target_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = MyBotAgent(0, fountain=(0, 0))
+    sim = FakeInput()
+    hero = make_hero()
+    far, near = make_enemy(1, (5600, 5000)), make_enemy(2, (5100, 5000))
+
+    agent.tick(hero, make_game(enemies=[far, near]), sim)
+    agent.tick(hero, make_game(enemies=[far, near]), sim)
+
+    assert agent.ai.game_state["target_id"] == 2
+    assert sim.clicks == [(5100, 5000)]
+
+
+def test_my_bot_agent_reissues_when_target_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = MyBotAgent(0, fountain=(0, 0))
+    sim = FakeInput()
+    hero = make_hero()
+
+    agent.tick(hero, make_game(enemies=[make_enemy(1, (5100, 5000))]), sim)
+    agent.tick(hero, make_game(enemies=[make_enemy(2, (5050, 5000)), make_enemy(1, (5200, 5000))]), sim)
+
+    assert sim.clicks == [(5100, 5000), (5050, 5000)]
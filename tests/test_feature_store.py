@@ -0,0 +1,107 @@
+import numpy as np
+
+from vision.feature_store import BufferPool, FrameFeatureStore
+
+
+RED = ((0, 150, 120), (8, 255, 255))
+GREEN = ((45, 120, 100), (75, 255, 255))
+
+
+def make_frame(width=64, height=48):
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[10:15, 10:40] = (0, 0, 230)
+    return frame
+
+
+# ----------------------------------------------------------------------
+# FrameFeatureStore
+
+def test_repeated_products_are_cache_hits():
+    store = FrameFeatureStore()
+    store.begin_frame(make_frame())
+
+    hsv = store.hsv()
+    mask = store.mask(*RED)
+    assert store.hsv() is hsv
+    assert store.mask(*RED) is mask
+
+    stats = store.get_stats()
+    # mask() внутри берёт hsv() из кеша
+    assert stats['tick_misses'] == 2
+    assert stats['tick_hits'] == 3
+
+
+def test_mask_values():
+    store = FrameFeatureStore()
+    store.begin_frame(make_frame())
+
+    mask = store.mask(*RED)
+    assert mask[12, 20] == 255
+    assert mask[30, 20] == 0
+
+
+def test_buffers_reused_across_frames():
+    store = FrameFeatureStore()
+    store.begin_frame(make_frame())
+    hsv = store.hsv()
+
+    store.begin_frame(make_frame())
+    assert store.hsv() is hsv
+
+
+def test_steady_state_allocates_nothing():
+    store = FrameFeatureStore()
+
+    for _ in range(3):
+        store.begin_frame(make_frame())
+        store.hsv()
+        store.mask(*RED)
+        store.mask(*GREEN)
+        store.gray()
+
+    assert store.get_stats()['tick_bytes_allocated'] == 0
+
+
+def test_sparse_masks_do_not_reallocate():
+    # Как в контроллере: маски по всему кадру только каждый 5-й кадр
+    store = FrameFeatureStore()
+
+    for frame in range(20):
+        store.begin_frame(make_frame())
+        store.hsv()
+        if frame % 5 == 0:
+            store.mask(*RED)
+            store.mask(*GREEN)
+        if frame >= 5:
+            assert store.get_stats()['tick_bytes_allocated'] == 0
+
+    assert store.pool.bytes_evicted == 0
+
+
+def test_frame_shape_change_evicts_old_buffers():
+    store = FrameFeatureStore()
+    store.begin_frame(make_frame())
+    old = store.hsv().nbytes
+
+    store.begin_frame(make_frame(width=32, height=24))
+    store.hsv()
+
+    assert store.pool.bytes_evicted == old
+    assert store.pool.pooled_bytes() == store.hsv().nbytes
+
+
+# ----------------------------------------------------------------------
+# BufferPool
+
+def test_pool_evicts_after_idle_frames():
+    pool = BufferPool(max_idle_frames=2)
+    pool.acquire((4, 4))
+    pool.release_all()
+
+    pool.release_all()
+    pool.release_all()
+    assert pool.pooled_bytes() == 16
+
+    pool.release_all()
+    assert pool.pooled_bytes() == 0
+    assert pool.bytes_evicted == 16
@@ -0,0 +1,71 @@
+from ai.types import GameState, HeroState, Unit
+from sim.agents import EngineAgent
+from sim.input import SimInputSimulator
+from sim.world import ABILITIES, NUKE_RANGE, SimWorld
+
+
+def make_world(distance):
+    world = SimWorld(num_heroes=2)
+    world.pos[1] = world.pos[0] + (distance, 0)
+    return world
+
+
+def test_nuke_damages_nearest_enemy_in_range():
+    world = make_world(NUKE_RANGE - 100)
+    hp, mana = world.hp[1], world.mana[0]
+
+    assert world.cast(0, 'q')
+    assert world.hp[1] == hp - ABILITIES['q'][2]
+    assert world.mana[0] == mana - ABILITIES['q'][0]
+    assert world.stats['casts'] == 1
+
+    # Способность на перезарядке
+    assert not world.cast(0, 'q')
+    assert not world.hero_state(0).abilities_ready['q']
+
+
+def test_nuke_out_of_range_fails():
+    world = make_world(NUKE_RANGE + 100)
+
+    assert not world.cast(0, 'q')
+    assert world.stats['casts'] == 0
+    assert world.hero_state(0).abilities_ready['q']
+
+
+def test_heal_restores_hp():
+    world = make_world(NUKE_RANGE + 100)
+    world.hp[0] = 200
+
+    assert world.cast(0, 'w')
+    assert world.hp[0] == 200 + ABILITIES['w'][2]
+
+
+def test_engine_agent_casts_ready_abilities():
+    world = make_world(NUKE_RANGE - 100)
+    world.hp[0] = 200
+    hero, game = world.observe(0)
+
+    EngineAgent().tick(hero, game, SimInputSimulator(world, 0))
+    assert world.stats['casts'] == 2
+    assert world.hp[1] < world.max_hp[1]
+
+
+def test_agent_skips_abilities_not_ready():
+    keys = []
+
+    class KeyInput:
+        def press_key(self, key):
+            keys.append(key)
+
+        def move_mouse(self, x, y):
+            pass
+
+        def right_click(self):
+            pass
+
+    hero = HeroState(200, 1000, 0, 1, (0, 0), {'q': False, 'w': False}, {}, True)
+    enemy = Unit("hero", 600, 600, (100, 0), is_enemy=True, is_hero=True, unit_id=1)
+    game = GameState(0.0, [enemy], [], [], [enemy])
+
+    EngineAgent().tick(hero, game, KeyInput())
+    assert keys == []
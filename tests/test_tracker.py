@@ -0,0 +1,121 @@
+import numpy as np
+
+from ai.types import Unit
+from sim.render import ALLY_BAR, BACKGROUND, ENEMY_BAR, draw_hp_bar
+from vision.feature_store import FrameFeatureStore
+from vision.tracker import UnitTracker
+from vision.unit_detector import check_tracks, detect_units
+
+
+def make_unit(position, is_enemy=True, is_hero=False, hp=20, max_hp=24):
+    return Unit("creep", hp, max_hp, position, is_enemy=is_enemy, is_hero=is_hero)
+
+
+def make_store(bars, width=320, height=180):
+    """bars: (x, y, width, height, fill, is_enemy)"""
+    frame = np.full((height, width, 3), BACKGROUND, dtype=np.uint8)
+    for x, y, bar_w, bar_h, fill, is_enemy in bars:
+        draw_hp_bar(frame, x, y, bar_w, bar_h, fill, ENEMY_BAR if is_enemy else ALLY_BAR)
+
+    store = FrameFeatureStore()
+    store.begin_frame(frame)
+    return store
+
+
+# ----------------------------------------------------------------------
+# UnitTracker
+
+def test_ids_persist_under_constant_velocity():
+    tracker = UnitTracker()
+    first = tracker.update([make_unit((100, 100)), make_unit((200, 100))], 0.0)
+    ids = [u.unit_id for u in first]
+
+    for step in range(1, 6):
+        units = tracker.update([
+            make_unit((100 + 30 * step, 100)),
+            make_unit((200 + 30 * step, 100))
+        ], step * 0.5)
+        assert [u.unit_id for u in units] == ids
+
+    assert tracker.stats['created'] == 2
+    np.testing.assert_allclose(tracker.tracks[ids[0]].velocity, (60, 0), atol=3)
+
+
+def test_assign_never_matches_different_kind():
+    tracker = UnitTracker()
+    enemy = tracker.update([make_unit((100, 100), is_enemy=True)], 0.0)[0]
+
+    ally = make_unit((102, 100), is_enemy=False)
+    tracker.update([ally], 0.5)
+
+    assert ally.unit_id != enemy.unit_id
+    assert tracker.tracks[enemy.unit_id].misses == 1
+
+
+def test_coasting_track_reported_as_predicted():
+    tracker = UnitTracker()
+    tracker.update([make_unit((100, 100))], 0.0)
+    tracker.update([make_unit((130, 100))], 0.5)
+
+    units = tracker.update([], 1.0)
+    assert len(units) == 1
+    assert units[0].predicted
+    assert units[0].position[0] > 130
+
+    units = tracker.update([make_unit((190, 100))], 1.5)
+    assert not units[0].predicted
+
+
+def test_track_pruned_after_max_misses():
+    tracker = UnitTracker(max_misses=2)
+    tracker.update([make_unit((100, 100))], 0.0)
+
+    for step in range(1, 3):
+        assert len(tracker.update([], step * 0.5)) == 1
+
+    assert tracker.update([], 1.5) == []
+    assert tracker.stats['removed'] == 1
+
+
+# ----------------------------------------------------------------------
+# detect_units / check_tracks
+
+def test_detect_units_class_from_height_and_hp_from_fill():
+    store = make_store([
+        (100, 50, 60, 8, 0.5, True),
+        (200, 50, 24, 4, 1.0, False),
+    ])
+    units = sorted(detect_units(store), key=lambda u: u.position)
+
+    hero, creep = units
+    assert hero.is_hero and hero.is_enemy
+    assert (hero.hp, hero.max_hp) == (30, 60)
+    assert hero.position[0] == 100
+
+    assert not creep.is_hero and not creep.is_enemy
+    assert (creep.hp, creep.max_hp) == (24, 24)
+
+
+def test_check_tracks_follows_moved_bar():
+    tracker = UnitTracker()
+    tracker.update(detect_units(make_store([(100, 50, 24, 4, 0.5, True)])), 0.0)
+
+    store = make_store([(110, 52, 24, 4, 0.5, True)])
+    measurements = check_tracks(store, tracker.predict(0.5), 0.5)
+
+    assert list(measurements.values()) == [(110, 51, 12)]
+
+
+def test_check_tracks_rejects_bar_claimed_by_two_tracks():
+    tracker = UnitTracker()
+    tracker.update(detect_units(make_store([
+        (100, 50, 24, 4, 0.5, True),
+        (140, 50, 24, 4, 0.5, True),
+    ])), 0.0)
+
+    # Юниты сошлись: на кадре одна полоска между предсказаниями
+    store = make_store([(120, 50, 24, 4, 0.5, True)])
+    measurements = check_tracks(store, tracker.predict(0.5), 0.5)
+
+    assert len(measurements) == 2
+    assert all(m is None for m in measurements.values())
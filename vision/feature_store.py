@@ -0,0 +1,249 @@
+# vision/feature_store.py
+"""
+Покадровое хранилище признаков изображения.
+
+Все анализаторы одного тика получают производные продукты кадра (HSV, gray,
+уровни пирамиды, цветовые маски, ROI) из одного места: каждый продукт
+считается лениво при первом запросе и запоминается до следующего кадра.
+Буферы под результаты берутся из пула и переиспользуются между кадрами.
+"""
+
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+
+import cv2
+import numpy as np
+
+
+class BufferPool:
+    """
+    Пул numpy-буферов, сгруппированных по (shape, dtype).
+    Буферы формы, не запрашивавшейся больше max_idle_frames кадров подряд,
+    выбрасываются из пула; clear() выбрасывает всё сразу.
+    """
+
+    def __init__(self, max_idle_frames: int = 30):
+        self.max_idle_frames = max_idle_frames
+        self._free: Dict[Tuple[Tuple[int, ...], str], List[np.ndarray]] = {}
+        self._leased: List[np.ndarray] = []
+        # Номер кадра, в котором ключ последний раз запрашивался
+        self._last_used: Dict[Tuple[Tuple[int, ...], str], int] = {}
+        self._frame = 0
+        self.bytes_allocated = 0
+        self.bytes_evicted = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Выдать буфер нужной формы: из пула или новый"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        free = self._free.get(key)
+        self._last_used[key] = self._frame
+
+        if free:
+            buf = free.pop()
+        else:
+            buf = np.empty(shape, dtype=dtype)
+            self.bytes_allocated += buf.nbytes
+
+        self._leased.append(buf)
+        return buf
+
+    def release_all(self):
+        """
+        Вернуть в пул все выданные буферы (конец кадра) и выбросить
+        буферы форм, не запрашивавшихся дольше max_idle_frames кадров.
+        """
+        for buf in self._leased:
+            self._free.setdefault((buf.shape, buf.dtype.str), []).append(buf)
+        self._leased.clear()
+
+        stale = [key for key, used in self._last_used.items()
+                 if self._frame - used > self.max_idle_frames]
+        for key in stale:
+            del self._last_used[key]
+            self.bytes_evicted += sum(b.nbytes for b in self._free.pop(key, ()))
+
+        self._frame += 1
+
+    def clear(self):
+        """Выбросить все свободные буферы (например, после смены размера кадра)"""
+        self.bytes_evicted += sum(b.nbytes for bufs in self._free.values() for b in bufs)
+        self._free.clear()
+        self._last_used.clear()
+
+    def pooled_bytes(self) -> int:
+        """Суммарный размер всех буферов, которыми владеет пул"""
+        free = sum(b.nbytes for bufs in self._free.values() for b in bufs)
+        return free + sum(b.nbytes for b in self._leased)
+
+
+class FrameFeatureStore:
+    """
+    Ленивое мемоизирующее хранилище признаков текущего кадра.
+
+    Использование:
+        store.begin_frame(image)      # раз в тик
+        hsv = store.hsv()             # считается один раз за кадр
+        mask = store.mask(lower, upper)
+
+    Возвращаемые массивы принадлежат хранилищу и действительны только
+    до следующего begin_frame() — их нельзя сохранять между тиками.
+    """
+
+    def __init__(self):
+        self.pool = BufferPool()
+        self.frame: Optional[np.ndarray] = None
+        self.frame_index = 0
+
+        self._cache: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+        # Статистика текущего тика и накопленная
+        self._tick_hits = 0
+        self._tick_misses = 0
+        self._tick_bytes_start = 0
+        self.stats = {
+            'frames': 0,
+            'hits': 0,
+            'misses': 0
+        }
+
+    def begin_frame(self, image: np.ndarray):
+        """Начать новый кадр: сбросить кеш и вернуть буферы в пул"""
+        self._cache.clear()
+        self.pool.release_all()
+        # Сменился размер окна — буферы старых форм больше не понадобятся
+        if self.frame is not None and self.frame.shape != image.shape:
+            self.pool.clear()
+
+        self.frame = image
+        self.frame_index += 1
+        self.stats['frames'] += 1
+
+        self._tick_hits = 0
+        self._tick_misses = 0
+        self._tick_bytes_start = self.pool.bytes_allocated
+
+    # ------------------------------------------------------------------
+    # Производные продукты кадра
+
+    def hsv(self) -> np.ndarray:
+        """Кадр в HSV"""
+        key = ('hsv',)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        dst = self.pool.acquire(self._frame().shape)
+        return self._store(key, cv2.cvtColor(self._frame(), cv2.COLOR_BGR2HSV, dst=dst))
+
+    def gray(self) -> np.ndarray:
+        """Кадр в оттенках серого"""
+        key = ('gray',)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        dst = self.pool.acquire(self._frame().shape[:2])
+        return self._store(key, cv2.cvtColor(self._frame(), cv2.COLOR_BGR2GRAY, dst=dst))
+
+    def pyramid(self, level: int) -> np.ndarray:
+        """Уровень гауссовой пирамиды BGR-кадра (0 — исходный кадр)"""
+        if level < 0:
+            raise ValueError(f"Уровень пирамиды должен быть >= 0: {level}")
+        if level == 0:
+            return self._frame()
+
+        key = ('pyramid', level)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        src = self.pyramid(level - 1)
+        h, w = src.shape[:2]
+        size = ((w + 1) // 2, (h + 1) // 2)
+        dst = self.pool.acquire((size[1], size[0]) + src.shape[2:])
+        return self._store(key, cv2.pyrDown(src, dst=dst, dstsize=size))
+
+    def mask(self, lower: Sequence[int], upper: Sequence[int]) -> np.ndarray:
+        """Цветовая маска по диапазону HSV"""
+        lower = tuple(int(v) for v in lower)
+        upper = tuple(int(v) for v in upper)
+
+        key = ('mask', lower, upper)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        hsv = self.hsv()
+        dst = self.pool.acquire(hsv.shape[:2])
+        result = cv2.inRange(
+            hsv,
+            np.array(lower, dtype=np.uint8),
+            np.array(upper, dtype=np.uint8),
+            dst=dst
+        )
+        return self._store(key, result)
+
+    def roi(self, x: int, y: int, w: int, h: int, source: str = 'bgr') -> np.ndarray:
+        """
+        Вырезка области кадра (view без копирования).
+        source: 'bgr', 'hsv' или 'gray'
+        """
+        key = ('roi', source, x, y, w, h)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        if source == 'bgr':
+            img = self._frame()
+        elif source == 'hsv':
+            img = self.hsv()
+        elif source == 'gray':
+            img = self.gray()
+        else:
+            raise ValueError(f"Неизвестный источник ROI: {source}")
+
+        height, width = img.shape[:2]
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(width, x + w), min(height, y + h)
+        return self._store(key, img[y1:max(y1, y2), x1:max(x1, x2)])
+
+    # ------------------------------------------------------------------
+    # Статистика
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кеша: текущий тик и накопленная"""
+        tick_total = self._tick_hits + self._tick_misses
+        total = self.stats['hits'] + self.stats['misses']
+
+        return {
+            'frame_index': self.frame_index,
+            'tick_hits': self._tick_hits,
+            'tick_misses': self._tick_misses,
+            'tick_hit_rate': self._tick_hits / tick_total if tick_total else 0.0,
+            'tick_bytes_allocated': self.pool.bytes_allocated - self._tick_bytes_start,
+            'hit_rate': self.stats['hits'] / total if total else 0.0,
+            'bytes_allocated': self.pool.bytes_allocated,
+            'bytes_evicted': self.pool.bytes_evicted,
+            'pooled_bytes': self.pool.pooled_bytes(),
+            **self.stats
+        }
+
+    # ------------------------------------------------------------------
+
+    def _frame(self) -> np.ndarray:
+        if self.frame is None:
+            raise RuntimeError("Кадр не задан: сначала вызовите begin_frame()")
+        return self.frame
+
+    def _lookup(self, key: Tuple[Any, ...]) -> Optional[np.ndarray]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._tick_hits += 1
+            self.stats['hits'] += 1
+        else:
+            self._tick_misses += 1
+            self.stats['misses'] += 1
+        return cached
+
+    def _store(self, key: Tuple[Any, ...], value: np.ndarray) -> np.ndarray:
+        self._cache[key] = value
+        return value
@@ -0,0 +1,227 @@
+# vision/tracker.py
+"""
+Трекер юнитов между кадрами.
+
+Держит постоянные ID юнитов, предсказывает их положение моделью постоянной
+скорости и сопоставляет предсказания с детекциями по матрице расстояний.
+Это позволяет запускать полную детекцию раз в N кадров, а в промежутке
+только уточнять треки дешёвыми проверками ROI.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.types import Unit
+
+# Штраф (px) за пиксель разницы заполненной части полоски HP при сопоставлении
+HP_WEIGHT = 4.0
+
+
+@dataclass
+class Track:
+    track_id: int
+    unit: Unit
+    position: np.ndarray
+    velocity: np.ndarray
+    last_update: float
+    hits: int = 1
+    misses: int = 0
+
+    def predict(self, t: float) -> np.ndarray:
+        """Положение трека в момент t (постоянная скорость)"""
+        return self.position + self.velocity * (t - self.last_update)
+
+
+class UnitTracker:
+    """Трекер с постоянными ID и жадным векторным сопоставлением"""
+
+    def __init__(self, max_distance: float = 80.0, max_misses: int = 5,
+                 velocity_smoothing: float = 0.5, hp_weight: float = HP_WEIGHT):
+        # Максимальное расстояние (px) между предсказанием и детекцией
+        self.max_distance = max_distance
+        # Сколько кадров подряд трек может прожить без подтверждения
+        self.max_misses = max_misses
+        # Вес новой оценки скорости при экспоненциальном сглаживании
+        self.velocity_smoothing = velocity_smoothing
+        self.hp_weight = hp_weight
+
+        self.tracks: Dict[int, Track] = {}
+        self._next_id = 1
+
+        self.stats = {
+            'created': 0,
+            'removed': 0,
+            'matched': 0
+        }
+
+    def predict(self, t: float) -> List[Tuple[Track, Tuple[int, int]]]:
+        """Предсказанные положения всех треков в момент t (без изменения состояния)"""
+        result = []
+        for track in self.tracks.values():
+            x, y = track.predict(t)
+            result.append((track, (int(round(x)), int(round(y)))))
+        return result
+
+    def update(self, detections: List[Unit], t: float) -> List[Unit]:
+        """
+        Полное обновление по детекциям кадра.
+        Несопоставленные детекции заводят новые треки,
+        несопоставленные треки копят промахи.
+        """
+        tracks = list(self.tracks.values())
+        matches, unmatched_tracks, unmatched_dets = self._assign(tracks, detections, t)
+
+        for ti, di in matches:
+            self._correct(tracks[ti], detections[di], t)
+
+        for ti in unmatched_tracks:
+            self._miss(tracks[ti], t)
+
+        for di in unmatched_dets:
+            self._create(detections[di], t)
+
+        self._prune()
+        return self.units()
+
+    def refine(self, measurements: Dict[int, Optional[Tuple[int, int, int]]], t: float) -> List[Unit]:
+        """
+        Обновление между полными детекциями.
+        measurements: track_id -> подтверждённые (x, y, hp) или None, если
+        проверка ROI юнит не нашла. Треки без измерения идут по предсказанию.
+        """
+        for track in list(self.tracks.values()):
+            measured = measurements.get(track.track_id)
+            if measured is None:
+                self._miss(track, t)
+                continue
+
+            x, y, hp = measured
+            unit = track.unit
+            self._correct(track, Unit(
+                name=unit.name,
+                hp=hp,
+                max_hp=unit.max_hp,
+                position=(x, y),
+                is_enemy=unit.is_enemy,
+                is_hero=unit.is_hero
+            ), t)
+
+        self._prune()
+        return self.units()
+
+    def units(self) -> List[Unit]:
+        """
+        Юниты всех живых треков с постоянными ID. Треки, не подтверждённые
+        в последнем обновлении, идут по предсказанию (unit.predicted) до
+        max_misses промахов подряд.
+        """
+        return [track.unit for track in self.tracks.values()]
+
+    def reset(self):
+        """Сбросить все треки"""
+        self.tracks.clear()
+
+    # ------------------------------------------------------------------
+
+    def _assign(self, tracks: List[Track], detections: List[Unit], t: float):
+        if not tracks or not detections:
+            return [], list(range(len(tracks))), list(range(len(detections)))
+
+        predicted = np.array([track.predict(t) for track in tracks], dtype=np.float32)
+        measured = np.array([d.position for d in detections], dtype=np.float32)
+
+        # Матрица расстояний (T, D)
+        diff = predicted[:, None, :] - measured[None, :, :]
+        cost = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+        # Заполненная часть полоски HP меняется медленно и отличает соседей
+        # в плотной волне, когда сдвиг за тик сравним с расстоянием между ними
+        track_hp = np.array([tr.unit.hp for tr in tracks], dtype=np.float32)
+        det_hp = np.array([d.hp for d in detections], dtype=np.float32)
+        cost += self.hp_weight * np.abs(track_hp[:, None] - det_hp[None, :])
+
+        # Юниты разных типов/сторон сопоставлять нельзя
+        track_kind = np.array([(tr.unit.is_enemy, tr.unit.is_hero) for tr in tracks], dtype=bool)
+        det_kind = np.array([(d.is_enemy, d.is_hero) for d in detections], dtype=bool)
+        same_kind = (track_kind[:, None, :] == det_kind[None, :, :]).all(axis=2)
+        cost[~same_kind] = np.inf
+
+        # Порог растёт с путём, пройденным со скоростью трека с последнего
+        # обновления: при редких тиках юнит успевает развернуться
+        travel = np.array([np.hypot(*tr.velocity) * max(0.0, t - tr.last_update) for tr in tracks])
+        gate = self.max_distance + 2 * travel
+
+        # Жадное сопоставление по возрастанию стоимости
+        order = np.argsort(cost, axis=None)
+        rows, cols = np.unravel_index(order, cost.shape)
+        costs = cost[rows, cols]
+        valid = costs <= gate[rows]
+        rows, cols = rows[valid], cols[valid]
+
+        used_rows = np.zeros(len(tracks), dtype=bool)
+        used_cols = np.zeros(len(detections), dtype=bool)
+        matches = []
+        limit = min(len(tracks), len(detections))
+
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            if used_rows[r] or used_cols[c]:
+                continue
+            used_rows[r] = used_cols[c] = True
+            matches.append((r, c))
+            if len(matches) == limit:
+                break
+
+        return (
+            matches,
+            np.flatnonzero(~used_rows).tolist(),
+            np.flatnonzero(~used_cols).tolist()
+        )
+
+    def _correct(self, track: Track, detection: Unit, t: float):
+        measured = np.array(detection.position, dtype=np.float32)
+        dt = t - track.last_update
+
+        if dt > 0:
+            velocity = (measured - track.position) / dt
+            a = self.velocity_smoothing
+            track.velocity = a * velocity + (1 - a) * track.velocity
+
+        track.position = measured
+        track.last_update = t
+        track.hits += 1
+        track.misses = 0
+
+        detection.unit_id = track.track_id
+        track.unit = detection
+        self.stats['matched'] += 1
+
+    def _miss(self, track: Track, t: float):
+        track.position = track.predict(t)
+        track.last_update = t
+        track.misses += 1
+
+        x, y = track.position
+        track.unit.position = (int(round(x)), int(round(y)))
+        track.unit.predicted = True
+
+    def _create(self, detection: Unit, t: float):
+        track_id = self._next_id
+        self._next_id += 1
+
+        detection.unit_id = track_id
+        self.tracks[track_id] = Track(
+            track_id=track_id,
+            unit=detection,
+            position=np.array(detection.position, dtype=np.float32),
+            velocity=np.zeros(2, dtype=np.float32),
+            last_update=t
+        )
+        self.stats['created'] += 1
+
+    def _prune(self):
+        stale = [tid for tid, tr in self.tracks.items() if tr.misses > self.max_misses]
+        for tid in stale:
+            del self.tracks[tid]
+        self.stats['removed'] += len(stale)
@@ -0,0 +1,151 @@
+# vision/unit_detector.py
+"""
+Детекция юнитов по полоскам HP над ними.
+
+detect_units() — полный проход по кадру (маски + контуры).
+check_tracks() — дешёвая проверка маленьких ROI вокруг предсказанных
+положений треков, используется между полными детекциями.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ai.types import Unit
+from vision.feature_store import FrameFeatureStore
+from vision.tracker import HP_WEIGHT, Track
+
+
+# Диапазоны HSV полосок HP: is_enemy -> (lower, upper)
+HP_BAR_COLORS = {
+    True: ((0, 150, 120), (8, 255, 255)),
+    False: ((45, 120, 100), (75, 255, 255)),
+}
+
+# Полоска HP: слева заполненная часть цвета стороны, справа — тёмная пустая.
+# HP и ширина полоски измеряются в пикселях: hp — заполненная часть,
+# max_hp — вся полоска
+MIN_BAR_WIDTH = 12
+MAX_BAR_WIDTH = 120
+MAX_BAR_HEIGHT = 10
+# Полоски героев выше полосок крипов — по высоте и различаем
+HERO_BAR_HEIGHT = 7
+# Яркость (V) пустой части полоски
+EMPTY_BAR_MAX_V = 25
+
+# Запас окна проверки трека на ошибку предсказания сверх пути,
+# который юнит мог пройти со скоростью трека
+ROI_MARGIN = 8
+# Скорость (px/с) для треков, скорость которых ещё не оценена
+ROI_MAX_SPEED = 120.0
+ROI_MIN_PIXELS = 4
+
+
+def detect_units(features: FrameFeatureStore) -> List[Unit]:
+    """Полная детекция юнитов на кадре"""
+    units = []
+    value = features.hsv()[:, :, 2]
+    frame_width = value.shape[1]
+
+    for is_enemy, (lower, upper) in HP_BAR_COLORS.items():
+        mask = features.mask(lower, upper)
+        contours = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if h > MAX_BAR_HEIGHT:
+                continue
+
+            # Пустая часть полоски — тёмные пиксели справа от заполненной
+            right = x + w
+            row = value[y + h // 2, right:min(frame_width, x + MAX_BAR_WIDTH)]
+            lit = np.flatnonzero(row > EMPTY_BAR_MAX_V)
+            bar_width = w + (int(lit[0]) if len(lit) else len(row))
+            if bar_width < MIN_BAR_WIDTH or bar_width < h * 2:
+                continue
+
+            is_hero = h >= HERO_BAR_HEIGHT
+            units.append(Unit(
+                name="hero" if is_hero else "creep",
+                hp=w,
+                max_hp=bar_width,
+                position=(x + bar_width // 2, y + h // 2),
+                is_enemy=is_enemy,
+                is_hero=is_hero
+            ))
+
+    return units
+
+
+def check_tracks(features: FrameFeatureStore,
+                 predictions: List[Tuple[Track, Tuple[int, int]]],
+                 t: float) -> Dict[int, Optional[Tuple[int, int, int]]]:
+    """
+    Проверка треков по маленьким окнам вокруг предсказанных положений в момент t.
+    Окно — полоска трека плюс путь, который юнит мог пройти с последнего
+    обновления; вырезается из закешированного HSV кадра, в нём ищутся
+    связные компоненты-полоски того же типа (герой/крип). Из них берётся
+    ближайшая к предсказанию с учётом разницы HP, как в UnitTracker.
+    Возвращает track_id -> (x, y, hp) полоски или None, если полосок нет
+    или эту же полоску заявил другой трек.
+    """
+    measurements = {}
+    height, width = features.hsv().shape[:2]
+    bounds = {
+        is_enemy: (np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+        for is_enemy, (lower, upper) in HP_BAR_COLORS.items()
+    }
+
+    for track, (px, py) in predictions:
+        bar_width = track.unit.max_hp
+        speed = np.hypot(*track.velocity) if track.hits > 1 else ROI_MAX_SPEED
+        slack = ROI_MARGIN + int(speed * max(0.0, t - track.last_update))
+        half_w = bar_width // 2 + slack
+        half_h = MAX_BAR_HEIGHT // 2 + slack
+
+        x1, y1 = max(0, px - half_w), max(0, py - half_h)
+        x2, y2 = min(width, px + half_w), min(height, py + half_h)
+        if x2 <= x1 or y2 <= y1:
+            measurements[track.track_id] = None
+            continue
+
+        # HSV кадра уже посчитан и закеширован; порог — только по окну
+        lower, upper = bounds[track.unit.is_enemy]
+        patch = cv2.inRange(features.roi(x1, y1, x2 - x1, y2 - y1, source='hsv'), lower, upper)
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(patch, connectivity=8)
+
+        # Компонента 0 — фон. Компоненты, обрезанные боковой границей окна, —
+        # это соседние юниты, попавшие в окно краем; полосками их не считаем
+        left = stats[:, cv2.CC_STAT_LEFT]
+        right = left + stats[:, cv2.CC_STAT_WIDTH]
+        is_hero = stats[:, cv2.CC_STAT_HEIGHT] >= HERO_BAR_HEIGHT
+        bars = [
+            i for i in range(1, count)
+            if stats[i, cv2.CC_STAT_AREA] >= ROI_MIN_PIXELS
+            and stats[i, cv2.CC_STAT_HEIGHT] <= MAX_BAR_HEIGHT
+            and is_hero[i] == track.unit.is_hero
+            and (left[i] > 0 or x1 == 0)
+            and (right[i] < x2 - x1 or x2 == width)
+        ]
+        if not bars:
+            measurements[track.track_id] = None
+            continue
+
+        # Заполненная часть начинается с левого края полоски
+        bars = np.array(bars)
+        xs = x1 + left[bars] + bar_width // 2
+        ys = y1 + centroids[bars, 1].astype(int)
+        hps = stats[bars, cv2.CC_STAT_WIDTH]
+        cost = np.hypot(xs - px, ys - py) + HP_WEIGHT * np.abs(hps - track.unit.hp)
+        best = int(np.argmin(cost))
+        measurements[track.track_id] = (int(xs[best]), int(ys[best]), int(hps[best]))
+
+    # Одна полоска не может подтвердить два трека (слившиеся юниты)
+    claimed = Counter(m[:2] for m in measurements.values() if m is not None)
+    for track_id, m in measurements.items():
+        if m is not None and claimed[m[:2]] > 1:
+            measurements[track_id] = None
+
+    return measurements